@@ -0,0 +1,187 @@
+# this profiles every .wav/.flac under dataset/<lang>/wav and writes dataset/metadata/profile.parquet
+# one row per recording, keyed by audio_filepath, with peak, clipping ratio, RMS, leading/trailing
+# silence, an SNR estimate and the characters-per-second ratio of the paired transcript.
+# when its profile_path is set, generate_metadata reads this file and drops utterances that fall
+# outside the quality thresholds, so clipped, silent or misaligned recordings never reach feature
+# extraction and training. DEFAULT_QUALITY_THRESHOLDS (dataset_utils) are starting points,
+# not tuned on our data.
+
+import os
+import time
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import soundfile as sf
+from tqdm import tqdm
+from concurrent.futures import ProcessPoolExecutor
+from dataset_utils import list_audio_files
+
+FRAME_SECONDS = 0.02  # 20 ms analysis frames
+SILENCE_TOP_DB = 40  # frames this far below the loudest frame count as silence
+CLIPPING_LEVEL = 0.999  # absolute sample value treated as clipped
+DB_FLOOR = -120.0  # reported instead of -inf for digital silence
+QUANTIZATION_POWER = (1 / 32768) ** 2  # frames below one 16-bit LSB RMS are digital silence
+
+PROFILE_SCHEMA = pa.schema(
+    [
+        ("audio_filepath", pa.string()),
+        ("duration", pa.float64()),
+        ("peak", pa.float32()),
+        ("clipping_ratio", pa.float32()),
+        ("rms_db", pa.float32()),
+        ("leading_silence", pa.float32()),
+        ("trailing_silence", pa.float32()),
+        ("snr_db", pa.float32()),
+        ("chars_per_second", pa.float32()),
+    ]
+)
+
+
+def to_db(power):
+    """
+    Convert a power ratio to decibels, clamped to DB_FLOOR.
+    """
+    return max(DB_FLOOR, 10 * np.log10(max(power, 1e-12)))
+
+
+def compute_audio_metrics(audio, sample_rate):
+    """
+    Compute the quality metrics for a (samples, channels) float array in [-1, 1].
+    """
+    duration = audio.shape[0] / sample_rate
+    if audio.shape[0] == 0:
+        return {
+            "duration": 0.0,
+            "peak": 0.0,
+            "clipping_ratio": 0.0,
+            "rms_db": DB_FLOOR,
+            "leading_silence": 0.0,
+            "trailing_silence": 0.0,
+            "snr_db": 0.0,
+        }
+
+    magnitude = np.abs(audio)
+    peak = float(magnitude.max())
+    clipping_ratio = float(np.count_nonzero(magnitude >= CLIPPING_LEVEL) / magnitude.size)
+
+    # Mix down to mono for the energy based metrics
+    mono = audio.mean(axis=1, dtype=np.float64)
+    rms_db = to_db(float(np.mean(mono**2)))
+
+    # Frame energies, the last partial frame is zero padded
+    frame_length = max(1, int(FRAME_SECONDS * sample_rate))
+    n_frames = -(-mono.shape[0] // frame_length)
+    frames = np.zeros(n_frames * frame_length)
+    frames[: mono.shape[0]] = mono
+    frame_power = np.mean(frames.reshape(n_frames, frame_length) ** 2, axis=1)
+
+    voiced = frame_power > frame_power.max() * 10 ** (-SILENCE_TOP_DB / 10)
+    if voiced.any():
+        voiced_idx = np.flatnonzero(voiced)
+        leading_silence = min(duration, voiced_idx[0] * FRAME_SECONDS)
+        trailing_silence = min(duration, (n_frames - 1 - voiced_idx[-1]) * FRAME_SECONDS)
+    else:
+        leading_silence = trailing_silence = duration
+
+    # SNR from the loud frames against the quiet frames, leaving out the zero padded tail frame
+    # and digitally silent frames (e.g. zero padding), which would otherwise set the noise floor
+    full_frames = frame_power[: mono.shape[0] // frame_length]
+    active = full_frames[full_frames > QUANTIZATION_POWER]
+    if active.size:
+        noise_power, signal_power = np.percentile(active, [10, 90])
+        snr_db = to_db(signal_power) - to_db(noise_power)
+    else:
+        snr_db = 0.0
+
+    return {
+        "duration": duration,
+        "peak": peak,
+        "clipping_ratio": clipping_ratio,
+        "rms_db": rms_db,
+        "leading_silence": leading_silence,
+        "trailing_silence": trailing_silence,
+        "snr_db": snr_db,
+    }
+
+
+def profile_audio_file(file_info):
+    """
+    Decode a single audio file once and profile it together with its transcript.
+    """
+    audio_path, txt_path = file_info
+    try:
+        audio, sample_rate = sf.read(audio_path, dtype="float32", always_2d=True)
+        metrics = compute_audio_metrics(audio, sample_rate)
+
+        # Transcript shares the file_nomenclature id with the audio file
+        chars_per_second = float("nan")
+        if os.path.exists(txt_path) and metrics["duration"] > 0:
+            with open(txt_path, "r", encoding="utf-8") as f:
+                transcript = f.read().strip()
+            chars_per_second = len(transcript) / metrics["duration"]
+
+        return {"audio_filepath": audio_path, **metrics, "chars_per_second": chars_per_second}
+    except Exception as e:
+        print(f"Error processing {audio_path}: {e}")
+        return None
+
+
+def profile_dataset(base_path, output_file):
+    """
+    Profile all .wav/.flac files in the dataset using multiprocessing and write the results to Parquet.
+    """
+    start_time = time.time()
+
+    # Collect all audio files with their transcripts
+    file_list = []
+    languages = [
+        lang
+        for lang in os.listdir(base_path)
+        if os.path.isdir(os.path.join(base_path, lang))
+    ]
+
+    for lang in languages:
+        wav_folder = os.path.join(base_path, lang, "wav")
+        txt_folder = os.path.join(base_path, lang, "txt")
+        if os.path.exists(wav_folder):
+            for f in list_audio_files(wav_folder):
+                base_name, _ = os.path.splitext(f)
+                file_list.append(
+                    (
+                        os.path.join(wav_folder, f),
+                        os.path.join(txt_folder, base_name + ".txt"),
+                    )
+                )
+
+    # Process files in parallel using ProcessPoolExecutor
+    with ProcessPoolExecutor() as executor:
+        results = list(
+            tqdm(
+                executor.map(profile_audio_file, file_list, chunksize=32),
+                total=len(file_list),
+                desc="Profiling Audio Files",
+            )
+        )
+
+    rows = [result for result in results if result is not None]
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    pq.write_table(
+        pa.Table.from_pylist(rows, schema=PROFILE_SCHEMA), output_file, compression="zstd"
+    )
+
+    print(f"Profiled {len(rows)} of {len(file_list)} files into {output_file}")
+
+    elapsed_time = time.time() - start_time
+    return elapsed_time
+
+
+if __name__ == "__main__":
+    # Set paths
+    dataset_path = "dataset"  # Replace with your dataset path
+    profile_file = os.path.join(dataset_path, "metadata", "profile.parquet")
+
+    # Profile the whole dataset
+    total_time = profile_dataset(dataset_path, profile_file)
+
+    # Print total time taken
+    print(f"Total time taken: {total_time:.2f} seconds")
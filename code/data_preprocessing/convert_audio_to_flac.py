@@ -0,0 +1,193 @@
+# this transcodes every .wav under dataset/<lang>/wav to lossless .flac
+# each converted file is decoded again and compared sample-by-sample with the original,
+# the .flac is written under a temporary .part name and only moved into place once it has been
+# verified to be bit-exact, then the .wav is removed. an interrupted run never leaves an
+# unverified x.flac next to x.wav.
+# the CSV/Parquet files in metadata/ are rewritten in the same step so audio_filepath points at the .flac files.
+
+import os
+import csv
+import time
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import soundfile as sf
+from tqdm import tqdm
+from concurrent.futures import ProcessPoolExecutor
+from dataset_utils import normalize_path
+
+# FLAC only stores integer PCM up to 24 bits, anything else is left as .wav
+FLAC_SUBTYPES = {"PCM_S8", "PCM_U8", "PCM_16", "PCM_24"}
+
+
+def convert_audio_file(file_info):
+    """
+    Transcode a single .wav file to .flac and verify the result bit-exactly.
+    Returns the (wav_path, flac_path) pair on success, None otherwise.
+    """
+    wav_path, keep_wav = file_info
+    flac_path = os.path.splitext(wav_path)[0] + ".flac"
+    part_path = flac_path + ".part"
+    try:
+        info = sf.info(wav_path)
+        if info.subtype not in FLAC_SUBTYPES:
+            print(f"Skipping {wav_path}: subtype {info.subtype} cannot be stored losslessly as FLAC")
+            return None
+
+        # Read as int32 so no scaling is applied and the comparison is exact
+        original, sample_rate = sf.read(wav_path, dtype="int32", always_2d=True)
+        subtype = "PCM_16" if info.subtype in {"PCM_S8", "PCM_U8"} else info.subtype
+        sf.write(part_path, original, sample_rate, format="FLAC", subtype=subtype)
+
+        decoded, decoded_rate = sf.read(part_path, dtype="int32", always_2d=True)
+        if decoded_rate != sample_rate or not np.array_equal(original, decoded):
+            os.remove(part_path)
+            print(f"Verification failed for {wav_path}, keeping the original")
+            return None
+
+        # Only a verified file ever appears under the .flac name
+        os.replace(part_path, flac_path)
+        if not keep_wav:
+            os.remove(wav_path)
+        return wav_path, flac_path
+    except Exception as e:
+        print(f"Error processing {wav_path}: {e}")
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        return None
+
+
+def remap_audio_paths(paths, converted, manifest_path):
+    """
+    Map manifest audio paths to their .flac counterparts, keeping each manifest's own spelling.
+    Warns about .wav paths that were not converted and no longer exist on disk.
+    """
+    new_paths = []
+    missing = 0
+    for path in paths:
+        if normalize_path(path) in converted:
+            path = os.path.splitext(path)[0] + ".flac"
+        elif path.endswith(".wav") and not os.path.exists(path):
+            missing += 1
+        new_paths.append(path)
+
+    if missing:
+        print(
+            f"Warning: {missing} .wav paths in {manifest_path} were not remapped "
+            f"and do not exist on disk, check the dataset path used to build it"
+        )
+    return new_paths
+
+
+def update_metadata_paths(metadata_dir, converted):
+    """
+    Point audio_filepath in every metadata CSV and Parquet table at the converted .flac files.
+    converted holds the normalized paths of the .wav files that were transcoded.
+    """
+    if not os.path.exists(metadata_dir):
+        print(f"Warning: metadata directory {metadata_dir} does not exist, no manifests updated")
+        return
+
+    csv_files = sorted([f for f in os.listdir(metadata_dir) if f.endswith(".csv")])
+
+    for csv_file in csv_files:
+        csv_path = os.path.join(metadata_dir, csv_file)
+
+        with open(csv_path, "r", newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            fieldnames = reader.fieldnames
+            rows = list(reader)
+
+        if not fieldnames or "audio_filepath" not in fieldnames:
+            continue
+
+        paths = [row["audio_filepath"] for row in rows]
+        new_paths = remap_audio_paths(paths, converted, csv_path)
+        updated = sum(old != new for old, new in zip(paths, new_paths))
+        for row, new_path in zip(rows, new_paths):
+            row["audio_filepath"] = new_path
+
+        if updated:
+            with open(csv_path, "w", newline="", encoding="utf-8-sig") as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(rows)
+            print(f"Updated {updated} paths in {csv_path}")
+
+    # Tables and their sidecars (train.phonemes.parquet etc.), which carry audio_filepath as a row key
+    parquet_files = sorted([f for f in os.listdir(metadata_dir) if f.endswith(".parquet")])
+
+    for parquet_file in parquet_files:
+        parquet_path = os.path.join(metadata_dir, parquet_file)
+        table = pq.read_table(parquet_path)
+
+        if "audio_filepath" not in table.column_names:
+            continue
+
+        paths = table.column("audio_filepath").to_pylist()
+        new_paths = remap_audio_paths(paths, converted, parquet_path)
+        updated = sum(old != new for old, new in zip(paths, new_paths))
+
+        if updated:
+            index = table.column_names.index("audio_filepath")
+            table = table.set_column(index, "audio_filepath", pa.array(new_paths, pa.string()))
+            pq.write_table(table, parquet_path, compression="zstd")
+            print(f"Updated {updated} paths in {parquet_path}")
+
+
+def convert_dataset_to_flac(base_path, metadata_dir=None, keep_wav=False):
+    """
+    Transcode all .wav files in the dataset to .flac using multiprocessing.
+    """
+    start_time = time.time()
+
+    # Collect all .wav files from the dataset
+    file_list = []
+    languages = [
+        lang
+        for lang in os.listdir(base_path)
+        if os.path.isdir(os.path.join(base_path, lang))
+    ]
+
+    for lang in languages:
+        wav_folder = os.path.join(base_path, lang, "wav")
+        if os.path.exists(wav_folder):
+            wav_files = [
+                os.path.join(wav_folder, f)
+                for f in os.listdir(wav_folder)
+                if f.endswith(".wav")
+            ]
+            file_list.extend([(wav_file, keep_wav) for wav_file in wav_files])
+
+    # Process files in parallel using ProcessPoolExecutor
+    with ProcessPoolExecutor() as executor:
+        results = list(
+            tqdm(
+                executor.map(convert_audio_file, file_list, chunksize=32),
+                total=len(file_list),
+                desc="Converting Audio Files to FLAC",
+            )
+        )
+
+    converted = {normalize_path(result[0]) for result in results if result is not None}
+
+    # Keep the manifests in sync with the files on disk
+    if metadata_dir is not None:
+        update_metadata_paths(metadata_dir, converted)
+
+    print(f"Converted {len(converted)} of {len(file_list)} files to FLAC")
+
+    elapsed_time = time.time() - start_time
+    return elapsed_time
+
+
+if __name__ == "__main__":
+    # Set paths
+    dataset_path = "dataset"  # Replace with your dataset path
+    metadata_dir = os.path.join(dataset_path, "metadata")
+
+    # Convert the whole dataset tree to FLAC, removing the verified .wav files
+    total_time = convert_dataset_to_flac(dataset_path, metadata_dir=metadata_dir)
+
+    # Print total time taken
+    print(f"Total time taken: {total_time:.2f} seconds")
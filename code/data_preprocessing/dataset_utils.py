@@ -0,0 +1,35 @@
+# small helpers shared by the preprocessing stages, kept free of audio/parquet imports
+# so that listing a folder or matching paths does not pull in soundfile, pyarrow or numpy.
+
+import os
+
+# Bounds used by generate_metadata on the audio_quality_profiling columns,
+# (min, max) per column, None leaves that side open
+DEFAULT_QUALITY_THRESHOLDS = {
+    "clipping_ratio": (None, 0.001),
+    "rms_db": (-45.0, None),
+    "leading_silence": (None, 1.5),
+    "trailing_silence": (None, 1.5),
+    "snr_db": (15.0, None),
+    "chars_per_second": (4.0, 30.0),
+}
+
+
+def list_audio_files(wav_folder):
+    """
+    List the audio files in a folder, one per utterance.
+    If both x.wav and x.flac exist (e.g. keep_wav=True), only x.flac is returned.
+    """
+    audio_files = {}
+    for f in sorted(os.listdir(wav_folder)):
+        base_name, ext = os.path.splitext(f)
+        if ext == ".flac" or (ext == ".wav" and base_name not in audio_files):
+            audio_files[base_name] = f
+    return sorted(audio_files.values())
+
+
+def normalize_path(path):
+    """
+    Canonical form of a path so "dataset/en_f/wav/x.wav" and "./dataset\\en_f/wav/x.wav" match.
+    """
+    return os.path.normcase(os.path.abspath(path.replace("\\", "/")))
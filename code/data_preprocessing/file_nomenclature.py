@@ -38,11 +38,12 @@ def rename_files(base_path):
                 new_txt_path = os.path.join(txt_folder, new_name + ext)
                 os.rename(old_txt_path, new_txt_path)
 
-                # Rename corresponding wav file if it exists
-                old_wav_path = os.path.join(wav_folder, base_name + ".wav")
-                if os.path.exists(old_wav_path):
-                    new_wav_path = os.path.join(wav_folder, new_name + ".wav")
-                    os.rename(old_wav_path, new_wav_path)
+                # Rename corresponding audio file (.wav or .flac) if it exists
+                for audio_ext in (".wav", ".flac"):
+                    old_wav_path = os.path.join(wav_folder, base_name + audio_ext)
+                    if os.path.exists(old_wav_path):
+                        new_wav_path = os.path.join(wav_folder, new_name + audio_ext)
+                        os.rename(old_wav_path, new_wav_path)
 
     with ThreadPoolExecutor() as executor:
         list(
@@ -1,15 +1,81 @@
 # this generates the train.csv, validation.csv, and the test.csv CSVs
 # these CSVs has 4 columns, audio_filepath, transcript, language, speaker_id
+# with metadata_format="parquet" it writes train.parquet etc. instead, where language and
+# speaker_id are dictionary-encoded. extra columns (phonemes, features) go into sidecar files
+# named <split>.<group>.parquet with the same row order, so the main table is never rewritten.
+# each sidecar also stores audio_filepath, which read_metadata checks against the main table
+# so sidecars left over from an earlier (differently shuffled) split are rejected.
+# if a profile.parquet from audio_quality_profiling is given, utterances outside the quality
+# thresholds are left out of all three splits. the filter is opt-in (apply_quality_filter below);
+# without explicit thresholds it uses DEFAULT_QUALITY_THRESHOLDS from dataset_utils,
+# e.g. clipping_ratio <= 0.001, snr_db >= 15 (90th vs 10th percentile frame energy, a rough
+# estimate) and 4-30 characters per second. check them against your data before relying on them.
 
 import os
 import random
 import csv
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dataset_utils import DEFAULT_QUALITY_THRESHOLDS, list_audio_files, normalize_path
+
+METADATA_SCHEMA = pa.schema(
+    [
+        ("audio_filepath", pa.string()),
+        ("transcript", pa.string()),
+        ("language", pa.dictionary(pa.int32(), pa.string())),
+        ("speaker_id", pa.dictionary(pa.int32(), pa.string())),
+    ]
+)
+
+
+def load_quality_profile(profile_path, quality_thresholds):
+    """
+    Read the threshold columns of a profile.parquet into a dict keyed by normalized audio_filepath.
+    """
+    columns = ["audio_filepath"] + list(quality_thresholds)
+    rows = pq.read_table(profile_path, columns=columns).to_pylist()
+    return {normalize_path(row.pop("audio_filepath")): row for row in rows}
 
 
-def generate_metadata(base_path, output_dir):
+def passes_quality_thresholds(profile_row, quality_thresholds):
+    """
+    Check a profiled utterance against (min, max) bounds, missing values are not filtered.
+    """
+    for column, (min_value, max_value) in quality_thresholds.items():
+        value = profile_row.get(column)
+        if value is None or value != value:  # missing or NaN
+            continue
+        if min_value is not None and value < min_value:
+            return False
+        if max_value is not None and value > max_value:
+            return False
+    return True
+
+
+def generate_metadata(
+    base_path,
+    output_dir,
+    metadata_format="csv",
+    profile_path=None,
+    quality_thresholds=None,
+):
     """
     Generate metadata for a dataset and split it into train, validation, and test sets.
+    metadata_format is either "csv" or "parquet".
+    If profile_path is given, utterances outside quality_thresholds
+    (DEFAULT_QUALITY_THRESHOLDS if None) are dropped.
     """
+    if metadata_format not in {"csv", "parquet"}:
+        raise ValueError(f"Unsupported metadata format: {metadata_format}")
+
+    profile = None
+    if profile_path is not None:
+        if quality_thresholds is None:
+            quality_thresholds = DEFAULT_QUALITY_THRESHOLDS
+        profile = load_quality_profile(profile_path, quality_thresholds)
+    filtered = 0
+    unprofiled = 0
+
     metadata = []
 
     # Traverse all subfolders in the dataset
@@ -24,15 +90,22 @@ def generate_metadata(base_path, output_dir):
         txt_folder = os.path.join(base_path, lang, "txt")
 
         if os.path.exists(wav_folder) and os.path.exists(txt_folder):
-            wav_files = sorted(
-                [f for f in os.listdir(wav_folder) if f.endswith(".wav")]
-            )
+            wav_files = list_audio_files(wav_folder)
 
             for wav_file in wav_files:
                 base_name, _ = os.path.splitext(wav_file)
                 txt_file = os.path.join(txt_folder, base_name + ".txt")
                 wav_path = os.path.join(wav_folder, wav_file)
 
+                # Skip utterances that failed quality profiling
+                if profile is not None:
+                    profile_row = profile.get(normalize_path(wav_path))
+                    if profile_row is None:
+                        unprofiled += 1
+                    elif not passes_quality_thresholds(profile_row, quality_thresholds):
+                        filtered += 1
+                        continue
+
                 # Extract language and speaker ID from the folder name
                 lang_code, gender = lang.split("_")
                 speaker_id = f"spk_{lang_code}_{gender}"
@@ -63,11 +136,20 @@ def generate_metadata(base_path, output_dir):
     val_data = metadata[train_split:val_split]
     test_data = metadata[val_split:]
 
-    # Write each set to a CSV file
+    # Write each set to a CSV or Parquet file
     os.makedirs(output_dir, exist_ok=True)
-    write_to_csv(train_data, os.path.join(output_dir, "train.csv"))
-    write_to_csv(val_data, os.path.join(output_dir, "validation.csv"))
-    write_to_csv(test_data, os.path.join(output_dir, "test.csv"))
+    writer = write_to_parquet if metadata_format == "parquet" else write_to_csv
+    writer(train_data, os.path.join(output_dir, f"train.{metadata_format}"))
+    writer(val_data, os.path.join(output_dir, f"validation.{metadata_format}"))
+    writer(test_data, os.path.join(output_dir, f"test.{metadata_format}"))
+
+    if profile is not None:
+        print(f"Filtered out {filtered} utterances below the quality thresholds")
+        if unprofiled:
+            print(
+                f"Warning: {unprofiled} utterances are missing from {profile_path} and were kept "
+                f"unfiltered, re-run audio_quality_profiling"
+            )
 
     print(
         f"Metadata generated:\n  Train: {len(train_data)}\n  Validation: {len(val_data)}\n  Test: {len(test_data)}"
@@ -87,10 +169,99 @@ def write_to_csv(data, output_file):
         writer.writerows(data)
 
 
+def write_to_parquet(data, output_file):
+    """
+    Write metadata rows to a Parquet file with dictionary-encoded language and speaker_id columns.
+    """
+    table = pa.Table.from_pylist(data, schema=METADATA_SCHEMA)
+    pq.write_table(table, output_file, compression="zstd")
+
+
+def sidecar_path(parquet_path, group):
+    """
+    Path of the sidecar file holding the given column group, e.g. train.phonemes.parquet.
+    """
+    base, _ = os.path.splitext(parquet_path)
+    return f"{base}.{group}.parquet"
+
+
+def write_sidecar(parquet_path, group, columns):
+    """
+    Write extra columns for a metadata table to a sidecar file without touching the table itself.
+    columns maps column names to lists (or arrays) in the same row order as the main table.
+    The table's audio_filepath column is stored alongside so read_metadata can verify the order.
+    """
+    keys = pq.read_table(parquet_path, columns=["audio_filepath"]).column("audio_filepath")
+    table = pa.table(columns)
+    if table.num_rows != len(keys):
+        raise ValueError(
+            f"Sidecar '{group}' has {table.num_rows} rows but {parquet_path} has {len(keys)}"
+        )
+    table = table.add_column(0, "audio_filepath", keys)
+    output_file = sidecar_path(parquet_path, group)
+    pq.write_table(table, output_file, compression="zstd")
+    return output_file
+
+
+def read_metadata(parquet_path, columns=None):
+    """
+    Read a Parquet metadata table together with its sidecar column groups.
+    Only the requested columns are read, e.g. columns=["audio_filepath"] skips the transcripts.
+    """
+    base, _ = os.path.splitext(parquet_path)
+    folder = os.path.dirname(parquet_path) or "."
+    prefix = os.path.basename(base) + "."
+    # <split>.<group>.parquet only, the group part must be non-empty so the table itself is skipped
+    sidecars = sorted(
+        os.path.join(folder, f)
+        for f in os.listdir(folder)
+        if f.startswith(prefix)
+        and f.endswith(".parquet")
+        and f[len(prefix) : -len(".parquet")]
+    )
+
+    main_names = pq.read_schema(parquet_path).names
+    wanted = main_names if columns is None else [c for c in main_names if c in columns]
+    main_table = pq.read_table(parquet_path, columns=list(set(wanted) | {"audio_filepath"}))
+    keys = main_table.column("audio_filepath")
+
+    names = list(wanted)
+    arrays = [main_table.column(name) for name in wanted]
+
+    for path in sidecars:
+        sidecar_names = [n for n in pq.read_schema(path).names if n != "audio_filepath"]
+        wanted = [
+            n for n in sidecar_names if (columns is None or n in columns) and n not in names
+        ]
+        if not wanted:
+            continue
+
+        sidecar = pq.read_table(path, columns=["audio_filepath"] + wanted)
+        if not sidecar.column("audio_filepath").equals(keys):
+            raise ValueError(
+                f"Sidecar {path} does not match the rows of {parquet_path}, regenerate it"
+            )
+        names.extend(wanted)
+        arrays.extend(sidecar.column(name) for name in wanted)
+
+    if not names:
+        raise ValueError(f"None of the columns {columns} found for {parquet_path}")
+
+    return pa.Table.from_arrays(arrays, names=names)
+
+
 if __name__ == "__main__":
     # Set paths
     dataset_path = "dataset"  # Replace with your dataset path
-    output_metadata_dir = "dataset\metadata"  # Directory to save metadata CSVs
+    output_metadata_dir = os.path.join(dataset_path, "metadata")  # Directory to save metadata CSVs
+    metadata_format = "csv"  # "csv" or "parquet"
+    profile_file = os.path.join(output_metadata_dir, "profile.parquet")  # from audio_quality_profiling
+    apply_quality_filter = False  # drop utterances outside DEFAULT_QUALITY_THRESHOLDS
 
     # Generate metadata
-    generate_metadata(dataset_path, output_metadata_dir)
+    generate_metadata(
+        dataset_path,
+        output_metadata_dir,
+        metadata_format=metadata_format,
+        profile_path=profile_file if apply_quality_filter else None,
+    )
@@ -2,11 +2,32 @@
 # which it takes from the phonemes folders present in the folders of all the 8 speakers.
 # the code is to be tested of course since i was running into RAM memory issues,
 # and thus the phoneme sequences haven't ben generate for like >90% dataset. 
+# for Parquet metadata the phonemes are written to a <split>.phonemes.parquet sidecar instead,
+# so the transcripts table is not rewritten.
 
 import os
 import pandas as pd
+import pyarrow.parquet as pq
 from phonemizer import phonemize
 from phonemizer.separator import Separator
+from metadata_generation import write_sidecar
+
+
+def phonemize_transcript(transcript, language, language_code_map):
+    """
+    Phonemize a single transcript using the metadata language column (e.g., en, gu).
+    """
+    language_code = language_code_map.get(language)
+
+    if language_code is None:
+        raise ValueError(f"No language mapping found for language: {language}")
+
+    return phonemize(
+        transcript,
+        language=language_code,
+        backend='espeak',
+        separator=Separator(word="|", syllable=" ", phone=""),
+    )
 
 def generate_phoneme_sequences(csv_path, language_code_map, output_path):
     """
@@ -14,37 +35,22 @@ def generate_phoneme_sequences(csv_path, language_code_map, output_path):
 
     Args:
         csv_path (str): Path to the input CSV file.
-        language_code_map (dict): Mapping of speaker prefixes to phonemizer language codes (e.g., {'en': 'en-us'}).
+        language_code_map (dict): Mapping of language codes to phonemizer language codes (e.g., {'en': 'en-us'}).
         output_path (str): Path to save the updated CSV.
     """
     # Load the CSV
     df = pd.read_csv(csv_path)
 
     # Ensure the expected columns exist
-    if 'transcript' not in df.columns or 'speaker_id' not in df.columns:
-        raise ValueError("The CSV must contain 'transcript' and 'speaker_id' columns.")
+    if 'transcript' not in df.columns or 'language' not in df.columns:
+        raise ValueError("The CSV must contain 'transcript' and 'language' columns.")
 
     # Initialize phoneme_sequence column
     df['phoneme_sequence'] = ""
 
     for index, row in df.iterrows():
-        transcript = row['transcript']
-        speaker_id = row['speaker_id']
-
-        # Determine language based on speaker ID prefix (e.g., en_f, gu_m)
-        lang_prefix = speaker_id.split('_')[0]  # Extract language prefix
-        language_code = language_code_map.get(lang_prefix)
-
-        if language_code is None:
-            raise ValueError(f"No language mapping found for speaker ID prefix: {lang_prefix}")
-
         # Generate phoneme sequence
-        phoneme_sequence = phonemize(
-            transcript,
-            language=language_code,
-            backend='espeak',
-            separator=Separator(word="|", syllable=" ", phone=""),
-        )
+        phoneme_sequence = phonemize_transcript(row['transcript'], row['language'], language_code_map)
 
         # Store in the DataFrame
         df.at[index, 'phoneme_sequence'] = phoneme_sequence
@@ -52,7 +58,30 @@ def generate_phoneme_sequences(csv_path, language_code_map, output_path):
     # Save updated CSV
     df.to_csv(output_path, index=False)
 
-# Mapping speaker ID prefixes to phonemizer language codes
+def generate_phoneme_sidecar(parquet_path, language_code_map):
+    """
+    Writes the phoneme sequences for a Parquet metadata table to its 'phonemes' sidecar file.
+
+    Args:
+        parquet_path (str): Path to the metadata Parquet file.
+        language_code_map (dict): Mapping of language codes to phonemizer language codes (e.g., {'en': 'en-us'}).
+
+    Returns:
+        str: Path of the written sidecar file.
+    """
+    # Only the columns needed for phonemization are read
+    table = pq.read_table(parquet_path, columns=['transcript', 'language'])
+    transcripts = table.column('transcript').to_pylist()
+    languages = table.column('language').to_pylist()
+
+    phoneme_sequences = [
+        phonemize_transcript(transcript, language, language_code_map)
+        for transcript, language in zip(transcripts, languages)
+    ]
+
+    return write_sidecar(parquet_path, 'phonemes', {'phoneme_sequence': phoneme_sequences})
+
+# Mapping metadata language codes to phonemizer language codes
 language_code_map = {
     'en': 'en-us',
     'gu': 'gu',
@@ -62,8 +91,14 @@ language_code_map = {
 
 # Paths to metadata CSVs
 metadata_folder = "dataset/metadata"
+metadata_format = "csv"  # "csv" or "parquet", must match metadata_generation
 
 for split in ['train', 'test', 'validation']:
+    if metadata_format == "parquet":
+        # Phonemes go to a sidecar next to the table, e.g. train.phonemes.parquet
+        generate_phoneme_sidecar(os.path.join(metadata_folder, f"{split}.parquet"), language_code_map)
+        continue
+
     input_csv = os.path.join(metadata_folder, f"{split}.csv")
     output_csv = os.path.join(metadata_folder, f"{split}_updated.csv")
 
@@ -2,6 +2,7 @@ import os
 from pydub import AudioSegment
 from tqdm import tqdm
 from concurrent.futures import ProcessPoolExecutor
+from dataset_utils import list_audio_files
 
 
 def normalize_audio_file(file_info):
@@ -13,16 +14,18 @@ def normalize_audio_file(file_info):
         audio = AudioSegment.from_file(wav_path)
         if audio.frame_rate != target_sample_rate:
             normalized_audio = audio.set_frame_rate(target_sample_rate)
-            normalized_audio.export(wav_path, format="wav")
+            # Re-export in the file's own container so .flac stays .flac
+            audio_format = os.path.splitext(wav_path)[1].lstrip(".").lower()
+            normalized_audio.export(wav_path, format=audio_format)
     except Exception as e:
         print(f"Error processing {wav_path}: {e}")
 
 
 def normalize_audio(base_path, target_sample_rate=16000):
     """
-    Normalize all .wav files in the dataset to a target sample rate using multiprocessing.
+    Normalize all .wav/.flac files in the dataset to a target sample rate using multiprocessing.
     """
-    # Collect all .wav files from the dataset
+    # Collect all audio files from the dataset
     file_list = []
     languages = [
         lang
@@ -34,9 +37,7 @@ def normalize_audio(base_path, target_sample_rate=16000):
         wav_folder = os.path.join(base_path, lang, "wav")
         if os.path.exists(wav_folder):
             wav_files = [
-                os.path.join(wav_folder, f)
-                for f in os.listdir(wav_folder)
-                if f.endswith(".wav")
+                os.path.join(wav_folder, f) for f in list_audio_files(wav_folder)
             ]
             file_list.extend([(wav_file, target_sample_rate) for wav_file in wav_files])
 
@@ -0,0 +1,146 @@
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+sf = pytest.importorskip("soundfile")
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+pytest.importorskip("tqdm")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_quality_profiling import (  # noqa: E402
+    PROFILE_SCHEMA,
+    compute_audio_metrics,
+    profile_audio_file,
+)
+from metadata_generation import (  # noqa: E402
+    generate_metadata,
+    passes_quality_thresholds,
+    read_metadata,
+)
+
+SAMPLE_RATE = 16000
+
+
+def tone(seconds, amplitude=0.5):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def test_silent_clip():
+    metrics = compute_audio_metrics(np.zeros((SAMPLE_RATE, 1), np.float32), SAMPLE_RATE)
+
+    assert metrics["duration"] == 1.0
+    assert metrics["peak"] == 0.0
+    assert metrics["clipping_ratio"] == 0.0
+    assert metrics["rms_db"] == -120.0
+    assert metrics["leading_silence"] == metrics["trailing_silence"] == 1.0
+    assert metrics["snr_db"] == 0.0
+
+
+def test_clipped_clip():
+    audio = np.clip(tone(1.0, amplitude=2.0), -1.0, 1.0)
+
+    metrics = compute_audio_metrics(audio[:, None], SAMPLE_RATE)
+
+    assert metrics["peak"] == 1.0
+    assert metrics["clipping_ratio"] > 0.5
+
+
+def test_leading_and_trailing_silence():
+    leading = np.zeros(int(0.3 * SAMPLE_RATE), np.float32)
+    trailing = np.zeros(int(0.2 * SAMPLE_RATE), np.float32)
+    audio = np.concatenate([leading, tone(1.0), trailing])
+
+    metrics = compute_audio_metrics(audio[:, None], SAMPLE_RATE)
+
+    assert metrics["duration"] == pytest.approx(1.5)
+    assert metrics["leading_silence"] == pytest.approx(0.3)
+    assert metrics["trailing_silence"] == pytest.approx(0.2)
+    assert metrics["rms_db"] == pytest.approx(10 * np.log10(0.125 / 1.5), abs=0.1)
+
+
+def test_chars_per_second(tmp_path):
+    wav_path = tmp_path / "en_f_00001.wav"
+    txt_path = tmp_path / "en_f_00001.txt"
+    sf.write(str(wav_path), tone(2.0), SAMPLE_RATE, subtype="PCM_16")
+    txt_path.write_text("hello there friend\n", encoding="utf-8")
+
+    row = profile_audio_file((str(wav_path), str(txt_path)))
+
+    assert row["audio_filepath"] == str(wav_path)
+    assert row["chars_per_second"] == pytest.approx(len("hello there friend") / 2.0)
+
+
+def test_passes_quality_thresholds():
+    thresholds = {"snr_db": (15.0, None), "chars_per_second": (4.0, 30.0)}
+
+    assert passes_quality_thresholds({"snr_db": 20.0, "chars_per_second": 12.0}, thresholds)
+    assert not passes_quality_thresholds({"snr_db": 10.0, "chars_per_second": 12.0}, thresholds)
+    assert not passes_quality_thresholds({"snr_db": 20.0, "chars_per_second": 45.0}, thresholds)
+    # Missing transcript (NaN) is not a reason to drop the utterance
+    assert passes_quality_thresholds(
+        {"snr_db": 20.0, "chars_per_second": float("nan")}, thresholds
+    )
+
+
+def test_generate_metadata_filters_on_profile(tmp_path, capsys):
+    wav_folder = tmp_path / "dataset" / "en_f" / "wav"
+    txt_folder = tmp_path / "dataset" / "en_f" / "txt"
+    wav_folder.mkdir(parents=True)
+    txt_folder.mkdir()
+    for i in range(1, 4):
+        (wav_folder / f"en_f_0000{i}.wav").write_bytes(b"")
+        (txt_folder / f"en_f_0000{i}.txt").write_text("hello", encoding="utf-8")
+
+    # en_f_00002 is clipped, en_f_00003 was never profiled
+    profile_path = tmp_path / "profile.parquet"
+    good = {
+        "duration": 1.0,
+        "peak": 0.5,
+        "clipping_ratio": 0.0,
+        "rms_db": -20.0,
+        "leading_silence": 0.1,
+        "trailing_silence": 0.1,
+        "snr_db": 30.0,
+        "chars_per_second": 5.0,
+    }
+    rows = [
+        {"audio_filepath": str(wav_folder / "en_f_00001.wav"), **good},
+        {"audio_filepath": str(wav_folder / "en_f_00002.wav"), **good, "clipping_ratio": 0.2},
+    ]
+    pq.write_table(pa.Table.from_pylist(rows, schema=PROFILE_SCHEMA), str(profile_path))
+
+    output_dir = tmp_path / "metadata"
+    generate_metadata(
+        str(tmp_path / "dataset"),
+        str(output_dir),
+        metadata_format="parquet",
+        profile_path=str(profile_path),
+    )
+
+    kept = []
+    for split in ["train", "validation", "test"]:
+        table = read_metadata(str(output_dir / f"{split}.parquet"), columns=["audio_filepath"])
+        kept.extend(os.path.basename(p) for p in table.column("audio_filepath").to_pylist())
+    assert sorted(kept) == ["en_f_00001.wav", "en_f_00003.wav"]
+
+    out = capsys.readouterr().out
+    assert "Filtered out 1 utterances" in out
+    assert "Warning: 1 utterances are missing" in out
+
+
+def test_snr_ignores_zero_padding():
+    rng = np.random.default_rng(0)
+    noise = rng.normal(0, 0.1, SAMPLE_RATE).astype(np.float32)
+    # 0.4 s of digital silence in front plus a partial frame at the end
+    padded = np.concatenate([np.zeros(6400, np.float32), noise, np.zeros(100, np.float32)])
+
+    snr = compute_audio_metrics(noise[:, None], SAMPLE_RATE)["snr_db"]
+    padded_snr = compute_audio_metrics(padded[:, None], SAMPLE_RATE)["snr_db"]
+
+    assert padded_snr == pytest.approx(snr, abs=0.5)
+    assert padded_snr < 15
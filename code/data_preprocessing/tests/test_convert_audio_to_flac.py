@@ -0,0 +1,118 @@
+import csv
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+sf = pytest.importorskip("soundfile")
+pytest.importorskip("pyarrow")
+pytest.importorskip("tqdm")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import convert_audio_to_flac  # noqa: E402
+from convert_audio_to_flac import convert_audio_file, update_metadata_paths  # noqa: E402
+from dataset_utils import list_audio_files, normalize_path  # noqa: E402
+
+
+def write_wav(path, subtype="PCM_16"):
+    samples = (np.sin(np.arange(1600) / 5) * 20000).astype(np.int16)
+    sf.write(str(path), samples, 16000, subtype=subtype)
+    return samples
+
+
+def test_interrupted_conversion_leaves_no_flac(tmp_path, monkeypatch):
+    wav_path = tmp_path / "en_f_00001.wav"
+    write_wav(wav_path)
+
+    # Simulate the process dying while the written file is being verified
+    real_read = sf.read
+
+    def crash_on_part(path, *args, **kwargs):
+        if str(path).endswith(".part"):
+            raise RuntimeError("interrupted")
+        return real_read(path, *args, **kwargs)
+
+    monkeypatch.setattr(convert_audio_to_flac.sf, "read", crash_on_part)
+
+    assert convert_audio_file((str(wav_path), False)) is None
+    assert sorted(os.listdir(tmp_path)) == ["en_f_00001.wav"]
+    assert list_audio_files(str(tmp_path)) == ["en_f_00001.wav"]
+
+
+def test_list_audio_files_ignores_partial_flac(tmp_path):
+    write_wav(tmp_path / "en_f_00001.wav")
+    (tmp_path / "en_f_00001.flac.part").write_bytes(b"fLaC truncated")
+
+    assert list_audio_files(str(tmp_path)) == ["en_f_00001.wav"]
+
+
+def test_convert_audio_file_round_trip(tmp_path):
+    wav_path = tmp_path / "en_f_00001.wav"
+    samples = write_wav(wav_path)
+
+    result = convert_audio_file((str(wav_path), False))
+
+    flac_path = tmp_path / "en_f_00001.flac"
+    assert result == (str(wav_path), str(flac_path))
+    assert sorted(os.listdir(tmp_path)) == ["en_f_00001.flac"]
+    decoded, sample_rate = sf.read(str(flac_path), dtype="int16")
+    assert sample_rate == 16000
+    assert np.array_equal(decoded, samples)
+
+
+def test_convert_audio_file_keeps_float_wav(tmp_path):
+    wav_path = tmp_path / "en_f_00001.wav"
+    sf.write(str(wav_path), np.zeros(1600, dtype=np.float32), 16000, subtype="FLOAT")
+
+    assert convert_audio_file((str(wav_path), False)) is None
+    assert sorted(os.listdir(tmp_path)) == ["en_f_00001.wav"]
+
+
+def test_list_audio_files_one_per_utterance(tmp_path):
+    for name in ["en_f_00001.wav", "en_f_00001.flac", "en_f_00002.wav", "en_f_00003.flac"]:
+        (tmp_path / name).write_bytes(b"")
+    (tmp_path / "notes.txt").write_bytes(b"")
+
+    assert list_audio_files(str(tmp_path)) == [
+        "en_f_00001.flac",
+        "en_f_00002.wav",
+        "en_f_00003.flac",
+    ]
+
+
+def test_update_metadata_paths_matches_any_path_spelling(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    wav_folder = tmp_path / "dataset" / "en_f" / "wav"
+    wav_folder.mkdir(parents=True)
+    metadata_dir = tmp_path / "dataset" / "metadata"
+    metadata_dir.mkdir()
+
+    # Converted with an absolute base path, manifest written with other spellings
+    converted = {
+        normalize_path(str(wav_folder / f"en_f_0000{i}.wav")) for i in range(1, 4)
+    }
+    paths = [
+        "dataset/en_f/wav/en_f_00001.wav",
+        str(wav_folder / "en_f_00002.wav"),
+        "dataset\\en_f\\wav\\en_f_00003.wav",
+        "elsewhere/en_f/wav/en_f_00004.wav",
+    ]
+    csv_path = metadata_dir / "train.csv"
+    with open(csv_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=["audio_filepath", "transcript"])
+        writer.writeheader()
+        writer.writerows({"audio_filepath": p, "transcript": "hi"} for p in paths)
+
+    update_metadata_paths(str(metadata_dir), converted)
+
+    with open(csv_path, "r", newline="", encoding="utf-8-sig") as f:
+        updated = [row["audio_filepath"] for row in csv.DictReader(f)]
+    assert updated == [
+        "dataset/en_f/wav/en_f_00001.flac",
+        str(wav_folder / "en_f_00002.flac"),
+        "dataset\\en_f\\wav\\en_f_00003.flac",
+        "elsewhere/en_f/wav/en_f_00004.wav",
+    ]
+    assert "Warning: 1 .wav paths" in capsys.readouterr().out
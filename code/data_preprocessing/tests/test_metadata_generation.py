@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metadata_generation import read_metadata, write_sidecar, write_to_parquet  # noqa: E402
+
+ROWS = [
+    {
+        "audio_filepath": "dataset/en_f/wav/en_f_00001.flac",
+        "transcript": "hello there.",
+        "language": "en",
+        "speaker_id": "spk_en_f",
+    },
+    {
+        "audio_filepath": "dataset/gu_m/wav/gu_m_00001.flac",
+        "transcript": "કેમ છો?",
+        "language": "gu",
+        "speaker_id": "spk_gu_m",
+    },
+]
+
+
+def test_read_metadata_with_sidecar(tmp_path):
+    table_path = str(tmp_path / "train.parquet")
+    write_to_parquet(ROWS, table_path)
+    write_sidecar(table_path, "phonemes", {"phoneme_sequence": ["həloʊ", "kem tʃʰo"]})
+
+    table = read_metadata(table_path)
+    assert table.column_names == [
+        "audio_filepath",
+        "transcript",
+        "language",
+        "speaker_id",
+        "phoneme_sequence",
+    ]
+    assert pa.types.is_dictionary(table.schema.field("language").type)
+    assert table.column("phoneme_sequence").to_pylist() == ["həloʊ", "kem tʃʰo"]
+
+    assert read_metadata(table_path, columns=["audio_filepath"]).column_names == [
+        "audio_filepath"
+    ]
+    assert read_metadata(table_path, columns=["phoneme_sequence"]).column_names == [
+        "phoneme_sequence"
+    ]
+
+
+def test_read_metadata_rejects_stale_sidecar(tmp_path):
+    table_path = str(tmp_path / "train.parquet")
+    write_to_parquet(ROWS, table_path)
+    write_sidecar(table_path, "phonemes", {"phoneme_sequence": ["həloʊ", "kem tʃʰo"]})
+
+    # Regenerating the split reshuffles the rows but leaves the sidecar in place
+    write_to_parquet(ROWS[::-1], table_path)
+
+    with pytest.raises(ValueError):
+        read_metadata(table_path, columns=["transcript", "phoneme_sequence"])